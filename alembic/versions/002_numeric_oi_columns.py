@@ -0,0 +1,48 @@
+"""Convert OI and LTP columns from text to numeric
+
+Revision ID: 002
+Revises: 5a431f748304
+Create Date: 2026-08-31 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '5a431f748304'
+branch_labels = None
+depends_on = None
+
+# Numeric columns previously stored as String(50)
+HISTORICAL_NUMERIC_COLUMNS = ['prev_oi', 'latest_oi', 'call_oi_difference', 'put_oi_difference', 'ltp']
+LIVE_NUMERIC_COLUMNS = ['prev_oi', 'oi_diff']
+
+
+def upgrade() -> None:
+    """Change OI/LTP columns to Numeric(18, 4)"""
+    # Normalize legacy text values ("12,000", "") so the batch-copy rebuild
+    # converts them via NUMERIC affinity instead of carrying text through
+    for column in HISTORICAL_NUMERIC_COLUMNS:
+        op.execute(f"UPDATE historical_data SET {column} = NULLIF(REPLACE({column}, ',', ''), '')")
+    for column in LIVE_NUMERIC_COLUMNS:
+        op.execute(f"UPDATE live_data SET {column} = NULLIF(REPLACE({column}, ',', ''), '')")
+
+    with op.batch_alter_table('historical_data') as batch_op:
+        for column in HISTORICAL_NUMERIC_COLUMNS:
+            batch_op.alter_column(column, type_=sa.Numeric(18, 4))
+
+    with op.batch_alter_table('live_data') as batch_op:
+        for column in LIVE_NUMERIC_COLUMNS:
+            batch_op.alter_column(column, type_=sa.Numeric(18, 4))
+
+
+def downgrade() -> None:
+    """Revert OI/LTP columns to String(50)"""
+    with op.batch_alter_table('historical_data') as batch_op:
+        for column in HISTORICAL_NUMERIC_COLUMNS:
+            batch_op.alter_column(column, type_=sa.String(length=50))
+
+    with op.batch_alter_table('live_data') as batch_op:
+        for column in LIVE_NUMERIC_COLUMNS:
+            batch_op.alter_column(column, type_=sa.String(length=50))
@@ -0,0 +1,29 @@
+"""Add unique indexes used as UPSERT conflict targets
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-08-31 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create unique natural-key indexes for historical_data and live_data"""
+    op.create_index('uq_historical_stock_category_strike', 'historical_data',
+                    ['stock', 'category', 'strike'], unique=True)
+    op.create_index('uq_live_stock_section_label_strike', 'live_data',
+                    ['stock', 'section', 'label', 'strike'], unique=True)
+
+
+def downgrade() -> None:
+    """Drop the unique natural-key indexes"""
+    op.drop_index('uq_live_stock_section_label_strike', table_name='live_data')
+    op.drop_index('uq_historical_stock_category_strike', table_name='historical_data')
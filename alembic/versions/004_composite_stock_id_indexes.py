@@ -0,0 +1,29 @@
+"""Add composite (stock, id) indexes for summary queries
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-08-31 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create composite indexes matching WHERE stock = ? ORDER BY id"""
+    # SQLite has no INCLUDE clause; (stock, id) lets the summary queries
+    # walk the index in output order instead of filtering then sorting
+    op.create_index('idx_historical_stock_id', 'historical_data', ['stock', 'id'])
+    op.create_index('idx_live_stock_id', 'live_data', ['stock', 'id'])
+
+
+def downgrade() -> None:
+    """Drop the composite indexes"""
+    op.drop_index('idx_live_stock_id', table_name='live_data')
+    op.drop_index('idx_historical_stock_id', table_name='historical_data')
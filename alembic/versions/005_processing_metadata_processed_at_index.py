@@ -0,0 +1,26 @@
+"""Index processing_metadata.processed_at for last-run lookups
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-08-31 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create descending index matching ORDER BY processed_at DESC LIMIT 1"""
+    op.create_index('idx_processing_metadata_processed_at', 'processing_metadata',
+                    [sa.text('processed_at DESC')])
+
+
+def downgrade() -> None:
+    """Drop the processed_at index"""
+    op.drop_index('idx_processing_metadata_processed_at', table_name='processing_metadata')
@@ -0,0 +1,31 @@
+"""Drop single-column stock indexes superseded by (stock, id)
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-08-31 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Drop the redundant single-column stock indexes"""
+    # The composite (stock, id) indexes from revision 004 cover every
+    # stock-equality lookup, so the single-column ones only cost write time
+    op.execute("DROP INDEX IF EXISTS idx_historical_stock")
+    op.execute("DROP INDEX IF EXISTS idx_live_stock")
+    op.execute("DROP INDEX IF EXISTS ix_historical_data_stock")
+    op.execute("DROP INDEX IF EXISTS ix_live_data_stock")
+
+
+def downgrade() -> None:
+    """Recreate the single-column stock indexes"""
+    op.create_index('idx_historical_stock', 'historical_data', ['stock'])
+    op.create_index('idx_live_stock', 'live_data', ['stock'])
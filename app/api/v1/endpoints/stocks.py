@@ -2,48 +2,64 @@
 Stock Data Endpoints
 Handles stock list and summary data retrieval
 """
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Request, Response
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any
+import orjson
 
 from app.models.schemas import AllStocksResponse, StockSummaryResponse
 from app.services.stock_service import StockService
+from app.core.cache import stock_cache
 from app.core.config import settings
 
 router = APIRouter()
 stock_service = StockService()
 
 
-@router.get("/", response_model=AllStocksResponse, summary="Get all stocks")
-async def get_all_stocks() -> AllStocksResponse:
+@router.get("/", response_model=AllStocksResponse, response_class=ORJSONResponse, summary="Get all stocks")
+async def get_all_stocks() -> Response:
     """
     Retrieve list of all available stock symbols
-    
+
     Returns:
         AllStocksResponse: List of all stock symbols
     """
     try:
-        stocks = await stock_service.get_all_stocks()
-        return AllStocksResponse(all_stocks=stocks)
+        # Serve pre-serialized bytes; re-encoded only after an upload
+        # invalidates the cache
+        payload = stock_cache.get("all_stocks_json")
+        if payload is None:
+            stocks = await stock_service.get_all_stocks()
+            payload = orjson.dumps({"all_stocks": stocks})
+            stock_cache.set("all_stocks_json", payload)
+        return Response(content=payload, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stocks: {str(e)}")
 
 
-@router.get("/{stock}", response_model=StockSummaryResponse, summary="Get stock summary")
+@router.get("/{stock}", response_model=StockSummaryResponse, response_class=ORJSONResponse, summary="Get stock summary")
 async def get_stock_summary(
+    request: Request,
     stock: str = Path(..., description="Stock symbol (e.g., RELIANCE, TCS)")
-) -> StockSummaryResponse:
+) -> Response:
     """
     Retrieve historical and live data for a specific stock
-    
+
     Args:
         stock: Stock symbol in uppercase
-        
+
     Returns:
         StockSummaryResponse: Historical and live data for the stock
     """
     try:
-        summary = await stock_service.get_stock_summary(stock.upper())
-        return summary
+        # Pre-serialized bytes cached until an upload invalidates them;
+        # Pydantic validation is skipped on this hot read path
+        payload, etag = await stock_service.get_stock_summary_json(stock.upper())
+        # Conditional GET: matching clients get a bodyless 304
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=payload, media_type="application/json",
+                        headers={"ETag": etag})
     except FileNotFoundError:
         raise HTTPException(
             status_code=404, 
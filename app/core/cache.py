@@ -0,0 +1,48 @@
+"""
+In-Memory Cache
+Simple TTL cache for stock responses that change only when new Excel is uploaded
+"""
+import time
+from threading import Lock
+from typing import Any, Optional
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with per-entry expiry"""
+
+    def __init__(self, ttl: int = 86400):
+        """
+        Initialize cache
+
+        Args:
+            ttl: Seconds before an entry expires (default: 24 hours)
+        """
+        self.ttl = ttl
+        self._store: dict = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._store[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any):
+        """Cache a value with the configured TTL"""
+        with self._lock:
+            self._store[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        """Drop all cached entries (called after data changes)"""
+        with self._lock:
+            self._store.clear()
+
+
+# Global cache instance for stock list and summary responses
+stock_cache = TTLCache(ttl=86400)
@@ -3,6 +3,7 @@ Application Configuration
 Centralized settings management using Pydantic
 """
 from pydantic_settings import BaseSettings
+from functools import lru_cache
 from typing import List
 import os
 from pathlib import Path
@@ -68,5 +69,18 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Cached settings factory (env parsing and validation run once)"""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
+
+# Pre-resolved Path objects so callers don't rebuild Path(...) per use
+LIVE_DATA_DIR_PATH = Path(settings.LIVE_DATA_DIR)
+PROCESSED_DIR_PATH = Path(settings.PROCESSED_DIR)
+
+# Frozen view of the stock list for O(1) membership tests (list scans are O(n))
+ALL_STOCKS_SET = frozenset(settings.ALL_STOCKS)
@@ -3,6 +3,7 @@ SQLite Database Connection and Schema
 Optimized storage for stock data
 """
 import sqlite3
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 from typing import Optional
@@ -10,27 +11,129 @@ from datetime import datetime
 
 from app.core.config import settings
 
+# Connection-time PRAGMAs: WAL with relaxed (but safe) syncing, in-memory
+# temp store, 64 MB page cache, 256 MB mmap and a busy timeout so writers
+# don't fail immediately under concurrent access
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",  # Keep WAL bounded during market hours
+)
+
+
+# INSERT statements built once at import; identical SQL text also keeps
+# hitting the per-connection prepared-statement cache
+_HIST_INSERT_SQL = """
+    INSERT INTO historical_data
+    (stock, category, strike, prev_oi, latest_oi, call_oi_difference,
+     put_oi_difference, ltp, additional_strike, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+"""
+
+_LIVE_INSERT_SQL = """
+    INSERT INTO live_data
+    (stock, section, label, prev_oi, strike, oi_diff, is_new_strike, add_strike,
+     created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+"""
+
+
+def _hist_params(stock: str, data: dict) -> tuple:
+    """Pack one historical row into the _HIST_INSERT_SQL parameter order"""
+    return (
+        stock,
+        data.get("Category", ""),
+        data.get("Strike", ""),
+        data.get("Prev_OI", ""),
+        data.get("Latest_OI", ""),
+        data.get("Call_OI_Difference", ""),
+        data.get("Put_OI_Difference", ""),
+        data.get("LTP", ""),
+        data.get("Additional_Strike", "")
+    )
+
+
+def _live_params(stock: str, data: dict) -> tuple:
+    """Pack one live row into the _LIVE_INSERT_SQL parameter order"""
+    return (
+        stock,
+        data.get("Section", ""),
+        data.get("Label", ""),
+        data.get("Prev_OI", ""),
+        data.get("Strike", ""),
+        data.get("OI_Diff", ""),
+        data.get("Is_NewStrike", ""),
+        data.get("Add_Strike", "")
+    )
+
+
+def _historical_row_factory(cursor, row):
+    """Build the API-shaped historical dict straight from the driver row"""
+    return {
+        "Stock": row[0],
+        "Category": row[1],
+        "Strike": row[2],
+        "Prev_OI": row[3],
+        "Latest_OI": row[4],
+        "Call_OI_Difference": row[5],
+        "Put_OI_Difference": row[6],
+        "LTP": row[7],
+        "Additional_Strike": row[8]
+    }
+
+
+def _live_row_factory(cursor, row):
+    """Build the API-shaped live dict straight from the driver row"""
+    return {
+        "Stock": row[0],
+        "Section": row[1],
+        "Label": row[2],
+        "Prev_OI": row[3],
+        "Strike": row[4],
+        "OI_Diff": row[5],
+        "Is_NewStrike": row[6],
+        "Add_Strike": row[7]
+    }
+
 
 class Database:
     """SQLite database manager"""
-    
+
     def __init__(self):
         self.db_path = Path(settings.BASE_DIR) / "options_data.db"
+        self._local = threading.local()
         self.init_database()
-    
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with PRAGMAs applied"""
+        # Larger statement cache so repeated SQL skips sqlite3_prepare
+        conn = sqlite3.connect(str(self.db_path), cached_statements=256)
+        conn.row_factory = sqlite3.Row  # Access columns by name
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row  # Access columns by name
+        """Context manager for database connections
+
+        Connections are long-lived and reused per thread: re-opening one
+        per call re-parsed every statement, while reuse lets the driver's
+        prepared-statement cache amortize that cost across calls.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
         try:
             yield conn
             conn.commit()
         except Exception as e:
             conn.rollback()
             raise e
-        finally:
-            conn.close()
     
     def init_database(self):
         """Initialize database schema"""
@@ -55,10 +158,10 @@ class Database:
                 )
             """)
             
-            # Index for faster stock lookups
+            # Composite index serves WHERE stock = ? ORDER BY id directly
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_historical_stock 
-                ON historical_data(stock)
+                CREATE INDEX IF NOT EXISTS idx_historical_stock_id
+                ON historical_data(stock, id)
             """)
             
             # Table for live data
@@ -78,10 +181,10 @@ class Database:
                 )
             """)
             
-            # Index for faster stock lookups
+            # Composite index serves WHERE stock = ? ORDER BY id directly
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_live_stock 
-                ON live_data(stock)
+                CREATE INDEX IF NOT EXISTS idx_live_stock_id
+                ON live_data(stock, id)
             """)
             
             # Table for processing metadata
@@ -124,98 +227,68 @@ class Database:
     def insert_historical_data(self, stock: str, data: dict):
         """Insert historical data for a stock"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO historical_data 
-                (stock, category, strike, prev_oi, latest_oi, call_oi_difference, 
-                 put_oi_difference, ltp, additional_strike)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                stock.upper(),
-                data.get("Category", ""),
-                data.get("Strike", ""),
-                data.get("Prev_OI", ""),
-                data.get("Latest_OI", ""),
-                data.get("Call_OI_Difference", ""),
-                data.get("Put_OI_Difference", ""),
-                data.get("LTP", ""),
-                data.get("Additional_Strike", "")
-            ))
+            conn.execute(_HIST_INSERT_SQL, _hist_params(stock.upper(), data))
             conn.commit()
-    
+
     def insert_live_data(self, stock: str, data: dict):
         """Insert live data for a stock"""
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO live_data 
-                (stock, section, label, prev_oi, strike, oi_diff, is_new_strike, add_strike)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                stock.upper(),
-                data.get("Section", ""),
-                data.get("Label", ""),
-                data.get("Prev_OI", ""),
-                data.get("Strike", ""),
-                data.get("OI_Diff", ""),
-                data.get("Is_NewStrike", ""),
-                data.get("Add_Strike", "")
-            ))
+            conn.execute(_LIVE_INSERT_SQL, _live_params(stock.upper(), data))
             conn.commit()
-    
+
+    def bulk_insert_historical(self, stock: str, data_list: list):
+        """Bulk insert historical data in a single transaction"""
+        stock = stock.upper()  # Canonicalize once, not per row
+        with self.get_connection() as conn:
+            # Take the write lock up front instead of upgrading mid-batch
+            conn.execute("BEGIN IMMEDIATE")
+            # Generator streams tuples into executemany without an
+            # intermediate list
+            conn.executemany(
+                _HIST_INSERT_SQL, (_hist_params(stock, data) for data in data_list)
+            )
+            conn.commit()
+
+    def bulk_insert_live(self, stock: str, data_list: list):
+        """Bulk insert live data in a single transaction"""
+        stock = stock.upper()
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                _LIVE_INSERT_SQL, (_live_params(stock, data) for data in data_list)
+            )
+            conn.commit()
+
     def get_historical_data(self, stock: str) -> list:
         """Get historical data for a stock"""
         with self.get_connection() as conn:
+            # Row factory builds the response dicts during C-level fetch,
+            # so no per-row Python comprehension is needed afterwards
             cursor = conn.cursor()
+            cursor.row_factory = _historical_row_factory
             cursor.execute("""
-                SELECT stock, category, strike, prev_oi, latest_oi, 
+                SELECT stock, category, strike, prev_oi, latest_oi,
                        call_oi_difference, put_oi_difference, ltp, additional_strike
-                FROM historical_data 
+                FROM historical_data
                 WHERE stock = ?
                 ORDER BY id
             """, (stock.upper(),))
-            
-            rows = cursor.fetchall()
-            return [
-                {
-                    "Stock": row["stock"],
-                    "Category": row["category"],
-                    "Strike": row["strike"],
-                    "Prev_OI": row["prev_oi"],
-                    "Latest_OI": row["latest_oi"],
-                    "Call_OI_Difference": row["call_oi_difference"],
-                    "Put_OI_Difference": row["put_oi_difference"],
-                    "LTP": row["ltp"],
-                    "Additional_Strike": row["additional_strike"]
-                }
-                for row in rows
-            ]
-    
+
+            return cursor.fetchall()
+
     def get_live_data(self, stock: str) -> list:
         """Get live data for a stock"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = _live_row_factory
             cursor.execute("""
                 SELECT stock, section, label, prev_oi, strike, oi_diff, is_new_strike, add_strike
-                FROM live_data 
+                FROM live_data
                 WHERE stock = ?
                 ORDER BY id
             """, (stock.upper(),))
-            
-            rows = cursor.fetchall()
-            return [
-                {
-                    "Stock": row["stock"],
-                    "Section": row["section"],
-                    "Label": row["label"],
-                    "Prev_OI": row["prev_oi"],
-                    "Strike": row["strike"],
-                    "OI_Diff": row["oi_diff"],
-                    "Is_NewStrike": row["is_new_strike"],
-                    "Add_Strike": row["add_strike"]
-                }
-                for row in rows
-            ]
+
+            return cursor.fetchall()
     
     def get_all_stocks_from_db(self) -> list:
         """Get list of all stocks that have data"""
@@ -1,7 +1,14 @@
 """
 SQLAlchemy Database Connection and Session Management
 """
-from sqlalchemy import create_engine, distinct
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from pathlib import Path
@@ -10,7 +17,81 @@ from datetime import datetime
 
 from app.core.config import settings
 from app.models.base import Base
-from app.models.stock_models import HistoricalData, LiveData, ProcessingMetadata, UploadedFile
+from app.models.stock_models import (
+    HistoricalData, LiveData, ProcessingMetadata, UploadedFile, format_number
+)
+
+# Rows per INSERT statement during bulk loads
+BULK_CHUNK_SIZE = 10000
+
+# Metadata writer queue: flush after this many rows or this much waiting,
+# whichever comes first, so tiny log inserts share one commit/fsync
+META_BATCH_SIZE = 100
+META_BATCH_WAIT = 0.2  # seconds
+
+# Connection-time PRAGMAs: WAL journaling persists in the file, but cache,
+# temp store, mmap, synchronous and busy_timeout are per-connection and must
+# be reapplied every time the pool opens one
+CONNECT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",  # Keep WAL bounded during market hours
+)
+
+# Page size for freshly created databases; only takes effect while the
+# file is still empty. Larger pages mean fewer I/O ops per commit for
+# the row-heavy stock tables.
+PAGE_SIZE = 16384
+
+
+def _parse_number(value):
+    """Parse a formatted number string (e.g. "12,000" or "(500)") to float, or None"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    if negative:
+        text = text[1:-1]
+    text = re.sub(r'[^0-9\.\-]', '', text)
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return -number if negative else number
+
+
+def _upsert_stmt(table, key_cols, value_cols):
+    """SQLite UPSERT statement keyed on a table's natural-key unique index
+
+    The stock tables carry unique indexes on their natural keys, so a
+    plain INSERT raises IntegrityError whenever a load repeats a key.
+    Mirroring bulk_load_stock_data, conflicting rows update their value
+    columns (and updated_at) in place instead.
+    """
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=key_cols,
+        set_={col: stmt.excluded[col] for col in (*value_cols, "updated_at")},
+    )
+
+
+_HIST_UPSERT = _upsert_stmt(
+    HistoricalData.__table__,
+    ("stock", "category", "strike"),
+    ("prev_oi", "latest_oi", "call_oi_difference", "put_oi_difference",
+     "ltp", "additional_strike"),
+)
+_LIVE_UPSERT = _upsert_stmt(
+    LiveData.__table__,
+    ("stock", "section", "label", "strike"),
+    ("prev_oi", "oi_diff", "is_new_strike", "add_strike"),
+)
 
 
 class Database:
@@ -20,13 +101,52 @@ class Database:
         self.db_path = Path(settings.BASE_DIR) / "options_data.db"
         # Ensure the directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.db_path.exists() or self.db_path.stat().st_size == 0:
+            # Must happen before any table exists; existing databases
+            # keep their page size
+            conn = sqlite3.connect(str(self.db_path))
+            conn.execute(f"PRAGMA page_size={PAGE_SIZE}")
+            conn.execute("VACUUM")
+            conn.close()
         self.engine = create_engine(
             f"sqlite:///{self.db_path}",
             connect_args={"check_same_thread": False},  # Needed for SQLite
+            pool_size=20,           # Concurrent endpoints each hold a connection
+            max_overflow=40,
+            pool_pre_ping=True,     # Drop dead connections before handing them out
+            pool_recycle=3600,
             echo=False  # Set to True for SQL query logging
         )
+        # SQLite serializes writes anyway, so all write paths share one
+        # long-lived connection instead of churning pool checkouts
+        self.writer_engine = create_engine(
+            f"sqlite:///{self.db_path}",
+            connect_args={"check_same_thread": False},
+            pool_size=1,
+            max_overflow=0,
+            echo=False
+        )
+
+        for engine in (self.engine, self.writer_engine):
+            @event.listens_for(engine, "connect")
+            def _set_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                for pragma in CONNECT_PRAGMAS:
+                    cursor.execute(pragma)
+                cursor.close()
+
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.WriterSessionLocal = sessionmaker(autocommit=False, autoflush=False,
+                                               bind=self.writer_engine)
         self.init_database()
+
+        # Metadata log rows are queued and flushed in batches by a daemon
+        # thread: one fsync per batch instead of one per log call
+        self._meta_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._meta_thread = threading.Thread(
+            target=self._drain_metadata, name="metadata-writer", daemon=True
+        )
+        self._meta_thread.start()
     
     def init_database(self):
         """Initialize database schema"""
@@ -34,9 +154,13 @@ class Database:
         print(f"✅ Database initialized: {self.db_path}")
     
     @contextmanager
-    def get_session(self):
-        """Context manager for database sessions"""
-        session = self.SessionLocal()
+    def get_session(self, writer: bool = False):
+        """Context manager for database sessions
+
+        Args:
+            writer: If True, bind to the single-connection writer engine
+        """
+        session = self.WriterSessionLocal() if writer else self.SessionLocal()
         try:
             yield session
             session.commit()
@@ -57,133 +181,330 @@ class Database:
     # ==================== Historical Data ====================
     
     def insert_historical_data(self, stock: str, data: dict):
-        """Insert historical data for a stock"""
-        with self.get_session() as session:
-            historical = HistoricalData(
-                stock=stock.upper(),
-                category=data.get("Category", ""),
-                strike=data.get("Strike", ""),
-                prev_oi=data.get("Prev_OI", ""),
-                latest_oi=data.get("Latest_OI", ""),
-                call_oi_difference=data.get("Call_OI_Difference", ""),
-                put_oi_difference=data.get("Put_OI_Difference", ""),
-                ltp=data.get("LTP", ""),
-                additional_strike=data.get("Additional_Strike", "")
-            )
-            session.add(historical)
+        """Insert or update historical data for a stock"""
+        with self.get_session(writer=True) as session:
+            session.execute(_HIST_UPSERT, [self.historical_row(stock.upper(), data)])
     
     def get_historical_data(self, stock: str) -> List[Dict]:
         """Get historical data for a stock"""
+        table = HistoricalData.__table__
         with self.get_session() as session:
-            results = session.query(HistoricalData).filter(
-                HistoricalData.stock == stock.upper()
-            ).order_by(HistoricalData.id).all()
-            
-            return [result.to_dict() for result in results]
-    
-    def bulk_insert_historical(self, stock: str, data_list: List[dict]):
-        """Bulk insert historical data"""
-        with self.get_session() as session:
-            objects = [
-                HistoricalData(
-                    stock=stock.upper(),
-                    category=data.get("Category", ""),
-                    strike=data.get("Strike", ""),
-                    prev_oi=data.get("Prev_OI", ""),
-                    latest_oi=data.get("Latest_OI", ""),
-                    call_oi_difference=data.get("Call_OI_Difference", ""),
-                    put_oi_difference=data.get("Put_OI_Difference", ""),
-                    ltp=data.get("LTP", ""),
-                    additional_strike=data.get("Additional_Strike", "")
-                )
-                for data in data_list
+            # Core select: plain row tuples, no ORM instance construction,
+            # identity map or attribute instrumentation on the read path
+            rows = session.execute(
+                select(table).where(table.c.stock == stock.upper()).order_by(table.c.id)
+            )
+            return [
+                {
+                    "Stock": row.stock,
+                    "Category": row.category or "",
+                    "Strike": row.strike or "",
+                    "Prev_OI": format_number(row.prev_oi),
+                    "Latest_OI": format_number(row.latest_oi),
+                    "Call_OI_Difference": format_number(row.call_oi_difference),
+                    "Put_OI_Difference": format_number(row.put_oi_difference),
+                    "LTP": format_number(row.ltp),
+                    "Additional_Strike": row.additional_strike or ""
+                }
+                for row in rows
             ]
-            session.bulk_save_objects(objects)
+    
+    def bulk_insert_historical(self, stock: str, data_list: List[dict],
+                               session: Optional[Session] = None):
+        """Bulk upsert historical data, optionally inside a caller-owned session"""
+        # Core upsert + executemany: no ORM instance construction or state
+        # tracking, one prepared statement for the whole list
+        stock = stock.upper()  # Canonicalize once, not per row
+        rows = [self.historical_row(stock, data) for data in data_list]
+        if not rows:
+            return
+        if session is not None:
+            session.execute(_HIST_UPSERT, rows)
+            return
+        with self.get_session(writer=True) as session:
+            session.execute(_HIST_UPSERT, rows)
     
     # ==================== Live Data ====================
     
     def insert_live_data(self, stock: str, data: dict):
-        """Insert live data for a stock"""
-        with self.get_session() as session:
-            live = LiveData(
-                stock=stock.upper(),
-                section=data.get("Section", ""),
-                label=data.get("Label", ""),
-                prev_oi=data.get("Prev_OI", ""),
-                strike=data.get("Strike", ""),
-                oi_diff=data.get("OI_Diff", ""),
-                is_new_strike=data.get("Is_NewStrike", ""),
-                add_strike=data.get("Add_Strike", "")
-            )
-            session.add(live)
+        """Insert or update live data for a stock"""
+        with self.get_session(writer=True) as session:
+            session.execute(_LIVE_UPSERT, [self.live_row(stock.upper(), data)])
     
     def get_live_data(self, stock: str) -> List[Dict]:
         """Get live data for a stock"""
+        table = LiveData.__table__
         with self.get_session() as session:
-            results = session.query(LiveData).filter(
-                LiveData.stock == stock.upper()
-            ).order_by(LiveData.id).all()
-            
-            return [result.to_dict() for result in results]
-    
-    def bulk_insert_live(self, stock: str, data_list: List[dict]):
-        """Bulk insert live data"""
-        with self.get_session() as session:
-            objects = [
-                LiveData(
-                    stock=stock.upper(),
-                    section=data.get("Section", ""),
-                    label=data.get("Label", ""),
-                    prev_oi=data.get("Prev_OI", ""),
-                    strike=data.get("Strike", ""),
-                    oi_diff=data.get("OI_Diff", ""),
-                    is_new_strike=data.get("Is_NewStrike", ""),
-                    add_strike=data.get("Add_Strike", "")
-                )
-                for data in data_list
+            rows = session.execute(
+                select(table).where(table.c.stock == stock.upper()).order_by(table.c.id)
+            )
+            return [
+                {
+                    "Stock": row.stock,
+                    "Section": row.section or "",
+                    "Label": row.label or "",
+                    "Prev_OI": format_number(row.prev_oi),
+                    "Strike": row.strike or "",
+                    "OI_Diff": format_number(row.oi_diff),
+                    "Is_NewStrike": row.is_new_strike or "",
+                    "Add_Strike": row.add_strike or ""
+                }
+                for row in rows
             ]
-            session.bulk_save_objects(objects)
     
+    def bulk_insert_live(self, stock: str, data_list: List[dict],
+                         session: Optional[Session] = None):
+        """Bulk upsert live data, optionally inside a caller-owned session"""
+        stock = stock.upper()
+        rows = [self.live_row(stock, data) for data in data_list]
+        if not rows:
+            return
+        if session is not None:
+            session.execute(_LIVE_UPSERT, rows)
+            return
+        with self.get_session(writer=True) as session:
+            session.execute(_LIVE_UPSERT, rows)
+    
+    def bulk_insert_historical_many(self, rows: List[Dict],
+                                    session: Optional[Session] = None):
+        """Upsert pre-shaped historical rows for any number of stocks
+
+        One executemany for the whole load: callers accumulate rows via
+        historical_row and pay a single statement per table instead of a
+        round-trip per stock.
+        """
+        if not rows:
+            return
+        if session is not None:
+            session.execute(_HIST_UPSERT, rows)
+            return
+        with self.get_session(writer=True) as session:
+            session.execute(_HIST_UPSERT, rows)
+
+    def bulk_insert_live_many(self, rows: List[Dict],
+                              session: Optional[Session] = None):
+        """Upsert pre-shaped live rows for any number of stocks"""
+        if not rows:
+            return
+        if session is not None:
+            session.execute(_LIVE_UPSERT, rows)
+            return
+        with self.get_session(writer=True) as session:
+            session.execute(_LIVE_UPSERT, rows)
+
+    # ==================== Bulk Load ====================
+
+    # Indexes rebuilt after a full reload; dropping them first replaces
+    # per-row B-tree maintenance with one bulk index build
+    _STOCK_INDEXES = {
+        "idx_historical_stock_id": "CREATE INDEX IF NOT EXISTS idx_historical_stock_id ON historical_data(stock, id)",
+        "idx_live_stock_id": "CREATE INDEX IF NOT EXISTS idx_live_stock_id ON live_data(stock, id)",
+    }
+
+    @contextmanager
+    def drop_indexes_ctx(self, cursor):
+        """Drop the stock lookup indexes for the duration of a bulk load"""
+        for name in self._STOCK_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        yield
+        for ddl in self._STOCK_INDEXES.values():
+            cursor.execute(ddl)
+
+    @staticmethod
+    def historical_row(stock: str, data: dict) -> Dict:
+        """Map extracted historical data to a plain column dict
+
+        Callers pass an already-uppercased stock so bulk paths pay for
+        canonicalization once instead of once per row.
+        """
+        return {
+            "stock": stock,
+            "category": data.get("Category", ""),
+            "strike": data.get("Strike", ""),
+            "prev_oi": _parse_number(data.get("Prev_OI")),
+            "latest_oi": _parse_number(data.get("Latest_OI")),
+            "call_oi_difference": _parse_number(data.get("Call_OI_Difference")),
+            "put_oi_difference": _parse_number(data.get("Put_OI_Difference")),
+            "ltp": _parse_number(data.get("LTP")),
+            "additional_strike": data.get("Additional_Strike", "")
+        }
+
+    @staticmethod
+    def live_row(stock: str, data: dict) -> Dict:
+        """Map extracted live data to a plain column dict"""
+        return {
+            "stock": stock,
+            "section": data.get("Section", ""),
+            "label": data.get("Label", ""),
+            "prev_oi": _parse_number(data.get("Prev_OI")),
+            "strike": data.get("Strike", ""),
+            "oi_diff": _parse_number(data.get("OI_Diff")),
+            "is_new_strike": data.get("Is_NewStrike", ""),
+            "add_strike": data.get("Add_Strike", "")
+        }
+
+    def bulk_load_stock_data(self, historical_rows: List[Dict], live_rows: List[Dict],
+                             clear_existing: bool = True):
+        """
+        Load pre-mapped historical and live rows through the native sqlite3 driver
+
+        Bypasses per-statement SQLAlchemy overhead by running executemany on the
+        raw DBAPI connection inside a single BEGIN IMMEDIATE transaction, with
+        WAL journaling and synchronous=OFF for the duration of the load only.
+
+        Rows are UPSERTed on their natural key instead of truncating first,
+        so unchanged keys are updated in place; with clear_existing, rows not
+        touched by this load are deleted afterwards.
+        """
+        hist_sql = """
+            INSERT INTO historical_data
+            (stock, category, strike, prev_oi, latest_oi, call_oi_difference,
+             put_oi_difference, ltp, additional_strike, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(stock, category, strike) DO UPDATE SET
+                prev_oi=excluded.prev_oi,
+                latest_oi=excluded.latest_oi,
+                call_oi_difference=excluded.call_oi_difference,
+                put_oi_difference=excluded.put_oi_difference,
+                ltp=excluded.ltp,
+                additional_strike=excluded.additional_strike,
+                updated_at=excluded.updated_at
+        """
+        live_sql = """
+            INSERT INTO live_data
+            (stock, section, label, prev_oi, strike, oi_diff, is_new_strike,
+             add_strike, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(stock, section, label, strike) DO UPDATE SET
+                prev_oi=excluded.prev_oi,
+                oi_diff=excluded.oi_diff,
+                is_new_strike=excluded.is_new_strike,
+                add_strike=excluded.add_strike,
+                updated_at=excluded.updated_at
+        """
+        now = datetime.utcnow()
+        hist_tuples = [
+            (r["stock"], r["category"], r["strike"], r["prev_oi"], r["latest_oi"],
+             r["call_oi_difference"], r["put_oi_difference"], r["ltp"],
+             r["additional_strike"], now, now)
+            for r in historical_rows
+        ]
+        live_tuples = [
+            (r["stock"], r["section"], r["label"], r["prev_oi"], r["strike"],
+             r["oi_diff"], r["is_new_strike"], r["add_strike"], now, now)
+            for r in live_rows
+        ]
+
+        raw = self.writer_engine.raw_connection()
+        cursor = raw.cursor()
+        try:
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("BEGIN IMMEDIATE")
+
+            with self.drop_indexes_ctx(cursor):
+                for sql, tuples in ((hist_sql, hist_tuples), (live_sql, live_tuples)):
+                    for start in range(0, len(tuples), BULK_CHUNK_SIZE):
+                        cursor.executemany(sql, tuples[start:start + BULK_CHUNK_SIZE])
+
+            if clear_existing:
+                # Every upserted row carries updated_at == now, so anything
+                # older was absent from this load and is stale
+                cursor.execute("DELETE FROM historical_data WHERE updated_at < ?", (now,))
+                cursor.execute("DELETE FROM live_data WHERE updated_at < ?", (now,))
+
+            raw.commit()
+        except Exception as e:
+            raw.rollback()
+            raise e
+        finally:
+            # Restore durability unconditionally: the writer pool recycles
+            # this connection, so bailing out with synchronous=OFF would
+            # strip fsyncs from every later write on it
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            raw.close()
+
     # ==================== Stock Operations ====================
     
     def get_all_stocks_from_db(self) -> List[str]:
         """Get list of all stocks that have data"""
         with self.get_session() as session:
-            # Get distinct stocks from both tables
-            hist_stocks = session.query(distinct(HistoricalData.stock)).all()
-            live_stocks = session.query(distinct(LiveData.stock)).all()
-            
-            # Combine and deduplicate
-            all_stocks = set([s[0] for s in hist_stocks] + [s[0] for s in live_stocks])
-            return sorted(list(all_stocks))
+            # Single UNION pushed down to SQLite: the engine deduplicates
+            # and sorts one small result instead of two full scans
+            stmt = select(HistoricalData.stock).union(
+                select(LiveData.stock)
+            ).order_by(HistoricalData.stock)
+            return [row[0] for row in session.execute(stmt)]
     
-    def clear_stock_data(self, stock: Optional[str] = None):
+    def clear_stock_data(self, stock: Optional[str] = None,
+                         session: Optional[Session] = None):
         """Clear stock data (all stocks or specific stock)"""
-        with self.get_session() as session:
-            if stock:
-                session.query(HistoricalData).filter(
-                    HistoricalData.stock == stock.upper()
-                ).delete()
-                session.query(LiveData).filter(
-                    LiveData.stock == stock.upper()
-                ).delete()
-            else:
-                session.query(HistoricalData).delete()
-                session.query(LiveData).delete()
+        if session is not None:
+            self._clear_stock_data(session, stock)
+            return
+        with self.get_session(writer=True) as session:
+            self._clear_stock_data(session, stock)
+
+    @staticmethod
+    def _clear_stock_data(session: Session, stock: Optional[str] = None):
+        """Issue the delete statements on an open session"""
+        if stock:
+            session.query(HistoricalData).filter(
+                HistoricalData.stock == stock.upper()
+            ).delete()
+            session.query(LiveData).filter(
+                LiveData.stock == stock.upper()
+            ).delete()
+        else:
+            session.query(HistoricalData).delete()
+            session.query(LiveData).delete()
     
     # ==================== Processing Metadata ====================
-    
+
+    def _drain_metadata(self):
+        """Writer-thread loop: batch queued metadata rows into one insert
+
+        Blocks until a row arrives, then collects more for up to
+        META_BATCH_WAIT (or META_BATCH_SIZE rows) before flushing each
+        table's rows with a single executemany.
+        """
+        while True:
+            batches = {}
+            table, row = self._meta_queue.get()
+            batches.setdefault(table, []).append(row)
+
+            deadline = time.monotonic() + META_BATCH_WAIT
+            count = 1
+            while count < META_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    table, row = self._meta_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batches.setdefault(table, []).append(row)
+                count += 1
+
+            try:
+                with self.get_session(writer=True) as session:
+                    for table, rows in batches.items():
+                        session.execute(table.insert(), rows)
+            except Exception as e:
+                print(f"⚠️  Metadata writer error: {e}")
+
     def log_processing(self, process_type: str, stocks_processed: int, status: str, message: str):
-        """Log processing metadata"""
-        with self.get_session() as session:
-            metadata = ProcessingMetadata(
-                process_type=process_type,
-                stocks_processed=stocks_processed,
-                status=status,
-                message=message,
-                processed_at=datetime.utcnow()
-            )
-            session.add(metadata)
+        """Queue a processing metadata row for the batched writer
+
+        Fire-and-forget: the row becomes visible to readers within
+        META_BATCH_WAIT of being queued.
+        """
+        self._meta_queue.put((ProcessingMetadata.__table__, {
+            "process_type": process_type,
+            "stocks_processed": stocks_processed,
+            "status": status,
+            "message": message,
+            "processed_at": datetime.utcnow()
+        }))
     
     def get_last_processing_info(self) -> Optional[Dict]:
         """Get last processing information"""
@@ -197,16 +518,29 @@ class Database:
     # ==================== File Upload Tracking ====================
     
     def log_file_upload(self, file_type: str, file_name: str, file_size: int):
-        """Log file upload"""
-        with self.get_session() as session:
-            upload = UploadedFile(
-                file_type=file_type,
-                file_name=file_name,
-                file_size=file_size,
-                uploaded_at=datetime.utcnow()
-            )
-            session.add(upload)
+        """Queue a file upload row for the batched writer"""
+        self._meta_queue.put((UploadedFile.__table__, {
+            "file_type": file_type,
+            "file_name": file_name,
+            "file_size": file_size,
+            "uploaded_at": datetime.utcnow()
+        }))
     
+    def log_file_uploads(self, uploads: List[tuple]):
+        """Log several file uploads in a single INSERT/transaction
+
+        Args:
+            uploads: List of (file_type, file_name, file_size) tuples
+        """
+        now = datetime.utcnow()
+        rows = [
+            {"file_type": file_type, "file_name": file_name,
+             "file_size": file_size, "uploaded_at": now}
+            for file_type, file_name, file_size in uploads
+        ]
+        with self.get_session(writer=True) as session:
+            session.execute(UploadedFile.__table__.insert(), rows)
+
     def get_recent_uploads(self, limit: int = 10) -> List[Dict]:
         """Get recent file uploads"""
         with self.get_session() as session:
@@ -1,12 +1,18 @@
 """
 Pydantic Schemas for API Request/Response
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
+# Row models skip extra-field bookkeeping and are frozen, so cached
+# instances can be shared across requests without defensive copies
+_ROW_CONFIG = ConfigDict(extra='ignore', frozen=True)
+
 
 class HistoricalDataRow(BaseModel):
     """Historical data row schema"""
+    model_config = _ROW_CONFIG
+
     Stock: str = Field(..., description="Stock symbol")
     Category: str = Field(..., description="Category (Call Resistance/Put Support)")
     Strike: str = Field(..., description="Strike price")
@@ -20,6 +26,8 @@ class HistoricalDataRow(BaseModel):
 
 class LiveDataRow(BaseModel):
     """Live data row schema"""
+    model_config = _ROW_CONFIG
+
     Section: str = Field(..., description="Section name (Call Support/Resistance, Put Support/Resistance)")
     Label: str = Field(..., description="Label/identifier")
     Prev_OI: str = Field(..., description="Previous Open Interest")
@@ -32,6 +40,10 @@ class LiveDataRow(BaseModel):
 
 class StockSummaryResponse(BaseModel):
     """Stock summary response schema"""
+    # Frozen and closed: instances are built internally from exactly
+    # these two fields, so unknown keys are a bug, not input noise
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     historical: List[HistoricalDataRow] = Field(default_factory=list, description="Historical data")
     live: List[LiveDataRow] = Field(default_factory=list, description="Live data")
 
@@ -1,28 +1,38 @@
 """
 SQLAlchemy Models for Stock Data
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy import Column, Integer, Numeric, String, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
 
+def format_number(value) -> str:
+    """Format a numeric column for API output (comma-grouped, no trailing zeros)"""
+    if value is None:
+        return ""
+    return f"{float(value):,.4f}".rstrip("0").rstrip(".")
+
+
 class HistoricalData(BaseModel):
     """Historical stock data model"""
     
     __tablename__ = "historical_data"
     
-    stock = Column(String(50), nullable=False, index=True)
+    stock = Column(String(50), nullable=False)
     category = Column(String(100))
     strike = Column(String(50))
-    prev_oi = Column(String(50))
-    latest_oi = Column(String(50))
-    call_oi_difference = Column(String(50))
-    put_oi_difference = Column(String(50))
-    ltp = Column(String(50))
+    prev_oi = Column(Numeric(18, 4))
+    latest_oi = Column(Numeric(18, 4))
+    call_oi_difference = Column(Numeric(18, 4))
+    put_oi_difference = Column(Numeric(18, 4))
+    ltp = Column(Numeric(18, 4))
     additional_strike = Column(String(50))
     
     __table_args__ = (
-        Index('idx_historical_stock', 'stock'),
+        # (stock, id) serves both the equality filter and the ORDER BY id,
+        # making a separate single-column stock index redundant
+        Index('idx_historical_stock_id', 'stock', 'id'),
+        Index('uq_historical_stock_category_strike', 'stock', 'category', 'strike', unique=True),
     )
     
     def to_dict(self):
@@ -31,11 +41,11 @@ class HistoricalData(BaseModel):
             "Stock": self.stock,
             "Category": self.category or "",
             "Strike": self.strike or "",
-            "Prev_OI": self.prev_oi or "",
-            "Latest_OI": self.latest_oi or "",
-            "Call_OI_Difference": self.call_oi_difference or "",
-            "Put_OI_Difference": self.put_oi_difference or "",
-            "LTP": self.ltp or "",
+            "Prev_OI": format_number(self.prev_oi),
+            "Latest_OI": format_number(self.latest_oi),
+            "Call_OI_Difference": format_number(self.call_oi_difference),
+            "Put_OI_Difference": format_number(self.put_oi_difference),
+            "LTP": format_number(self.ltp),
             "Additional_Strike": self.additional_strike or ""
         }
 
@@ -45,17 +55,18 @@ class LiveData(BaseModel):
     
     __tablename__ = "live_data"
     
-    stock = Column(String(50), nullable=False, index=True)
+    stock = Column(String(50), nullable=False)
     section = Column(String(100))
     label = Column(String(100))
-    prev_oi = Column(String(50))
+    prev_oi = Column(Numeric(18, 4))
     strike = Column(String(50))
-    oi_diff = Column(String(50))
+    oi_diff = Column(Numeric(18, 4))
     is_new_strike = Column(String(10))
     add_strike = Column(String(50))
     
     __table_args__ = (
-        Index('idx_live_stock', 'stock'),
+        Index('idx_live_stock_id', 'stock', 'id'),
+        Index('uq_live_stock_section_label_strike', 'stock', 'section', 'label', 'strike', unique=True),
     )
     
     def to_dict(self):
@@ -64,9 +75,9 @@ class LiveData(BaseModel):
             "Stock": self.stock,
             "Section": self.section or "",
             "Label": self.label or "",
-            "Prev_OI": self.prev_oi or "",
+            "Prev_OI": format_number(self.prev_oi),
             "Strike": self.strike or "",
-            "OI_Diff": self.oi_diff or "",
+            "OI_Diff": format_number(self.oi_diff),
             "Is_NewStrike": self.is_new_strike or "",
             "Add_Strike": self.add_strike or ""
         }
@@ -82,7 +93,11 @@ class ProcessingMetadata(BaseModel):
     status = Column(String(50))
     message = Column(Text)
     processed_at = Column(DateTime, nullable=False)
-    
+
+    __table_args__ = (
+        Index('idx_processing_metadata_processed_at', processed_at.desc()),
+    )
+
     def to_dict(self):
         """Convert to dictionary for API response"""
         return {
@@ -3,12 +3,21 @@ Background Processor Service
 Automatically processes Excel files at regular intervals
 """
 import asyncio
-from datetime import datetime, time
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from time import localtime, monotonic
 from typing import Optional
 
 from app.services.data_processor import DataProcessorService
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# NSE Trading Hours: 9:15 AM - 3:30 PM IST (minutes 555-930), precomputed
+# as a minute-of-day bitmap so each check is a single C-level index
+_MARKET_MINUTES = bytes(1 if 555 <= m <= 930 else 0 for m in range(1440))
+
 
 class BackgroundProcessor:
     """Background task for automatic data processing"""
@@ -24,6 +33,11 @@ class BackgroundProcessor:
         self.process_interval = process_interval
         self.is_running = False
         self.task: Optional[asyncio.Task] = None
+        # Serializes processing runs so slow cycles never overlap
+        self._process_lock = asyncio.Lock()
+        # Log records are queued and written by a listener thread, so the
+        # event loop never blocks on a stdout flush
+        self._log_listener: Optional[QueueListener] = None
     
     def is_market_hours(self) -> bool:
         """
@@ -31,73 +45,112 @@ class BackgroundProcessor:
         
         NSE Trading Hours: 9:15 AM - 3:30 PM IST
         """
-        now = datetime.now().time()
-        market_open = time(9, 15)   # 9:15 AM
-        market_close = time(15, 30)  # 3:30 PM
-        
-        return market_open <= now <= market_close
+        lt = localtime()
+        return _MARKET_MINUTES[lt.tm_hour * 60 + lt.tm_min] == 1
     
+    async def _process_once(self) -> dict:
+        """Run one processing cycle in a worker thread
+
+        asyncio.to_thread keeps the event loop free to serve requests
+        while Excel parsing and the SQLite load run; the lock prevents
+        cycles from piling up when one exceeds process_interval.
+        """
+        async with self._process_lock:
+            # The bulk path UPSERTs on the natural keys and only deletes
+            # rows absent from the load, instead of truncating both
+            # tables and reinserting every 6 seconds
+            return await asyncio.to_thread(
+                self.processor.process_all_stocks_bulk, clear_existing=True
+            )
+
     async def process_loop(self):
         """
         Main processing loop
-        
+
         - During market hours: Process every 6 seconds
         - Outside market hours: Sleep for 5 minutes
+
+        Deadlines are tracked on the monotonic clock and advanced by whole
+        intervals, so runs stay on schedule instead of drifting by the
+        processing time of every iteration.
         """
-        print("🚀 Background processor started")
-        
+        logger.info("🚀 Background processor started")
+
+        next_deadline = monotonic()
         while self.is_running:
             try:
                 if self.is_market_hours():
                     # Market is open - process frequently
-                    print(f"\n[{datetime.now():%H:%M:%S}] 📊 Processing stocks...")
-                    
-                    start_time = datetime.now()
-                    result = self.processor.process_all_stocks(clear_existing=True)
-                    elapsed = (datetime.now() - start_time).total_seconds()
-                    
-                    print(f"   ✅ {result['stocks_processed']}/{result['total_stocks']} stocks updated in {elapsed:.2f}s")
-                    
-                    # Wait for remaining time to reach process_interval
-                    sleep_time = max(1, self.process_interval - elapsed)
-                    await asyncio.sleep(sleep_time)
-                    
+                    logger.info("📊 Processing stocks...")
+
+                    start_time = monotonic()
+                    result = await self._process_once()
+                    elapsed = monotonic() - start_time
+
+                    logger.info("✅ %s/%s stocks updated in %.2fs",
+                                result['stocks_processed'], result['total_stocks'], elapsed)
+
+                    # Advance to the next slot, skipping any already missed
+                    next_deadline += self.process_interval
+                    now = monotonic()
+                    while next_deadline <= now:
+                        next_deadline += self.process_interval
+                    await asyncio.sleep(next_deadline - now)
+
                 else:
                     # Market is closed - check less frequently
-                    now_str = datetime.now().strftime("%H:%M:%S")
-                    print(f"[{now_str}] 🌙 Market closed. Next check in 5 minutes...")
+                    logger.info("🌙 Market closed. Next check in 5 minutes...")
                     await asyncio.sleep(300)  # 5 minutes
-                    
+                    next_deadline = monotonic()
+
             except Exception as e:
-                print(f"❌ Background processor error: {e}")
+                logger.error("❌ Background processor error: %s", e)
                 await asyncio.sleep(60)  # Wait 1 minute on error
+                next_deadline = monotonic()
     
+    def _start_logging(self):
+        """Route this module's log records through a listener thread"""
+        if self._log_listener is not None:
+            return
+        log_queue = queue.SimpleQueue()
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S"))
+        logger.addHandler(QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        self._log_listener = QueueListener(log_queue, handler)
+        self._log_listener.start()
+
     async def start(self):
         """Start the background processor"""
+        self._start_logging()
         if self.is_running:
-            print("⚠️  Background processor already running")
+            logger.warning("⚠️  Background processor already running")
             return
-        
+
         self.is_running = True
         self.task = asyncio.create_task(self.process_loop())
-        print("✅ Background processor task created")
-    
+        logger.info("✅ Background processor task created")
+
     async def stop(self):
         """Stop the background processor"""
         if not self.is_running:
-            print("⚠️  Background processor not running")
+            logger.warning("⚠️  Background processor not running")
             return
-        
+
         self.is_running = False
-        
+
         if self.task:
             self.task.cancel()
             try:
                 await self.task
             except asyncio.CancelledError:
                 pass
-        
-        print("🛑 Background processor stopped")
+
+        logger.info("🛑 Background processor stopped")
+        if self._log_listener is not None:
+            self._log_listener.stop()  # Drains queued records before returning
+            self._log_listener = None
+            logger.handlers.clear()
     
     def get_status(self) -> dict:
         """Get current processor status"""
@@ -7,23 +7,49 @@ import os
 import pandas as pd
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from io import BytesIO
 import tempfile
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-from app.core.config import settings
+from app.core.cache import stock_cache
+from app.core.config import settings, ALL_STOCKS_SET, LIVE_DATA_DIR_PATH
 from app.core.database_sqlalchemy import db
 from app.models.schemas import ProcessStatusResponse
 from app.services.excel_utils import ExcelUtils
 
 
+_NON_WORD = re.compile(r'\W+')
+
+
+# One ExcelUtils per pool worker: its mtime-keyed caches mean each worker
+# parses the workbooks once and reuses the frames until the files change
+_worker_utils: Optional[ExcelUtils] = None
+
+
+def _extract_live_worker(args: tuple) -> tuple:
+    """Extract one stock's live rows inside a pool worker
+
+    Returns (stock, rows, error) so failures travel back as data instead
+    of poisoning the pool.
+    """
+    global _worker_utils
+    stock, live_path, hist_path = args
+    if _worker_utils is None:
+        _worker_utils = ExcelUtils()
+    try:
+        return stock, _worker_utils.extract_live_table(live_path, hist_path, stock), None
+    except Exception as e:
+        return stock, [], str(e)
+
+
 class DataProcessorService:
     """Service for processing Excel data and saving to SQLite"""
     
     def __init__(self):
-        self.live_data_dir = Path(settings.LIVE_DATA_DIR)
+        self.live_data_dir = LIVE_DATA_DIR_PATH
         self.hist_file = settings.HIST_FILE
         self.live_file = settings.LIVE_FILE
         self.all_stocks = settings.ALL_STOCKS
@@ -34,7 +60,49 @@ class DataProcessorService:
         
         self.last_process_time: Optional[datetime] = None
         self.last_process_count: int = 0
-    
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # (uppercased, cleaned) forms per symbol, computed once instead
+        # of re-deriving both in every processing cycle
+        self._stock_keys: Dict[str, tuple] = {
+            s: (s.upper(), _NON_WORD.sub('', s.upper())) for s in self.all_stocks
+        }
+
+    def _stock_key(self, stock: str) -> tuple:
+        """(uppercased, cleaned) forms of a symbol, cached per symbol"""
+        keys = self._stock_keys.get(stock)
+        if keys is None:
+            upper = stock.upper()
+            keys = self._stock_keys[stock] = (upper, _NON_WORD.sub('', upper))
+        return keys
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Lazily created, long-lived extraction pool
+
+        Keeping the workers alive across processing cycles preserves
+        their per-worker workbook caches, so a cycle only re-parses
+        Excel when the uploaded files actually change.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._executor
+
+    def _extract_live_all(self, live_path: Path, hist_path: Path):
+        """Extract live rows for every stock across the process pool
+
+        Per-stock extraction is independent pure-Python work, so it is
+        fanned out across cores. Returns ({stock: rows}, [error strings]).
+        """
+        args = [(stock, live_path, hist_path) for stock in self.all_stocks]
+        live_map: Dict[str, List[Dict]] = {}
+        errors: List[str] = []
+        for stock, rows, error in self._pool().map(_extract_live_worker, args, chunksize=8):
+            if error is not None:
+                errors.append(f"{stock}: {error}")
+                print(f"   [ERROR] {stock}: {error}")
+            else:
+                live_map[stock] = rows
+        return live_map, errors
+
     def process_all_stocks(self, clear_existing=True):
         """
         Process all stocks and save to SQLite database
@@ -53,33 +121,45 @@ class DataProcessorService:
             db.log_processing("full_process", 0, "error", msg)
             return {"status": "error", "message": msg}
         
-        # Clear existing data if requested
-        if clear_existing:
-            print("   Clearing existing data...")
-            db.clear_stock_data()
-        
         success = 0
-        errors = []
-        
+
+        # One pass over the historical sheet for every stock; live
+        # extraction fans out across the process pool
+        hist_map = self.utils.extract_all_historical(hist_path)
+        live_map, errors = self._extract_live_all(live_path, hist_path)
+
+        # Accumulate every stock's rows, then write each table with one
+        # statement instead of a round-trip per stock
+        all_hist: List[Dict] = []
+        all_live: List[Dict] = []
         for stock in self.all_stocks:
             try:
-                # Extract data
-                hist = self.utils.extract_historical_table(hist_path, stock)
-                live = self.utils.extract_live_table(live_path, hist_path, stock)
-                
-                # Save to database using bulk insert (faster)
-                if hist:
-                    db.bulk_insert_historical(stock, hist)
-                
-                if live:
-                    db.bulk_insert_live(stock, live)
-                
+                symbol, norm = self._stock_key(stock)
+                hist = hist_map.get(norm, [])
+                live = live_map.get(stock, [])
+
+                all_hist.extend(db.historical_row(symbol, row) for row in hist)
+                all_live.extend(db.live_row(symbol, row) for row in live)
+
                 if hist or live:
                     success += 1
             except Exception as e:
                 errors.append(f"{stock}: {str(e)}")
                 print(f"   [ERROR] {stock}: {e}")
+
+        # One session for the whole run: a single commit/fsync at the end
+        with db.get_session(writer=True) as session:
+            # Clear existing data if requested
+            if clear_existing:
+                print("   Clearing existing data...")
+                db.clear_stock_data(session=session)
+
+            db.bulk_insert_historical_many(all_hist, session=session)
+            db.bulk_insert_live_many(all_live, session=session)
         
+        # Drop cached responses now that the data changed
+        stock_cache.clear()
+
         self.last_process_time = datetime.now()
         self.last_process_count = success
         
@@ -97,8 +177,83 @@ class DataProcessorService:
             "errors": errors[:10]  # Return first 10 errors
         }
     
+    def process_all_stocks_bulk(self, clear_existing=True):
+        """
+        Process all stocks and load them in a single bulk transaction
+
+        Extracts every stock first, then hands the accumulated rows to
+        bulk_load_stock_data so the clear + inserts happen as one
+        transaction with chunked multi-row INSERTs instead of a
+        commit per stock.
+
+        Args:
+            clear_existing: If True, clears existing data before processing
+        """
+        print(f"\n[{datetime.now():%H:%M:%S}] Bulk processing {len(self.all_stocks)} stocks...")
+
+        live_path = self.live_data_dir / self.live_file
+        hist_path = self.live_data_dir / self.hist_file
+
+        if not live_path.exists() or not hist_path.exists():
+            msg = f"Missing files. Expected: {hist_path} and {live_path}"
+            print(f"   {msg}")
+            db.log_processing("bulk_process", 0, "error", msg)
+            return {"status": "error", "message": msg}
+
+        historical_rows = []
+        live_rows = []
+        success = 0
+
+        # One pass over the historical sheet for every stock; live
+        # extraction fans out across the process pool
+        hist_map = self.utils.extract_all_historical(hist_path)
+        live_map, errors = self._extract_live_all(live_path, hist_path)
+
+        for stock in self.all_stocks:
+            try:
+                # Precomputed keys; every row dict shares the symbol string
+                symbol, norm = self._stock_key(stock)
+                hist = hist_map.get(norm, [])
+                live = live_map.get(stock, [])
+
+                historical_rows.extend(db.historical_row(symbol, row) for row in hist)
+                live_rows.extend(db.live_row(symbol, row) for row in live)
+
+                if hist or live:
+                    success += 1
+            except Exception as e:
+                errors.append(f"{stock}: {str(e)}")
+                print(f"   [ERROR] {stock}: {e}")
+
+        # Single transaction: clear + chunked bulk inserts
+        db.bulk_load_stock_data(historical_rows, live_rows, clear_existing=clear_existing)
+
+        # Drop cached responses now that the data changed
+        stock_cache.clear()
+
+        self.last_process_time = datetime.now()
+        self.last_process_count = success
+
+        status_msg = f"Processed {success}/{len(self.all_stocks)} stocks successfully"
+        if errors:
+            status_msg += f". {len(errors)} errors occurred."
+
+        print(f"   {status_msg}")
+        db.log_processing("bulk_process", success, "success", status_msg)
+
+        return {
+            "status": "success",
+            "stocks_processed": success,
+            "total_stocks": len(self.all_stocks),
+            "errors": errors[:10]  # Return first 10 errors
+        }
+
     def process_single_stock(self, stock: str):
         """Process a single stock"""
+        stock = stock.upper()
+        if stock not in ALL_STOCKS_SET:
+            return {"status": "error", "message": f"Unknown stock: {stock}"}
+
         live_path = self.live_data_dir / self.live_file
         hist_path = self.live_data_dir / self.hist_file
         
@@ -120,6 +275,8 @@ class DataProcessorService:
             if live:
                 db.bulk_insert_live(stock, live)
             
+            stock_cache.clear()
+            
             return {
                 "status": "success",
                 "stock": stock,
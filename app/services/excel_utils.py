@@ -2,46 +2,214 @@
 Excel Utilities
 Helper functions for reading and processing Excel files
 """
+import numpy as np
 import pandas as pd
 import re
 import warnings
 from datetime import datetime
-from io import BytesIO
+from functools import lru_cache
+from openpyxl import load_workbook
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 # Suppress openpyxl warnings about unknown extensions
 warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
 
+# Patterns compiled once at import; the hot loops below would otherwise
+# pay a cache lookup (or recompile) per call
+_NON_DIGIT = re.compile(r'[^0-9]')
+_NON_NUM = re.compile(r'[^0-9\.]')
+_NON_WORD = re.compile(r'\W+')
+_STOCK_COL = re.compile(r'stock|symbol|name', re.I)
+_OPT_HEADER = re.compile(r'^\s*OPT[_\-\s]?[A-Za-z0-9]+', re.I)
+_OPT_SYMBOL = re.compile(r'OPT[_\-\s]*([A-Za-z0-9]+)', re.I)
+
+
+@lru_cache(maxsize=256)
+def _opt_block_pattern(stock_norm: str) -> re.Pattern:
+    """Per-stock block header pattern, compiled once per symbol"""
+    return re.compile(rf"OPT[_\-\s]*{re.escape(stock_norm)}", re.I)
+
+
+@lru_cache(maxsize=4096)
+def _format_number_cached(x) -> str:
+    """Comma-grouped rendering of one value, memoized
+
+    The same few hundred strike and OI values recur across every row,
+    so repeats skip the float conversion and the thousands-separator
+    format machinery entirely.
+    """
+    try:
+        return f"{float(x):,.0f}"
+    except (TypeError, ValueError):
+        return str(x)
+
+
+_DATE_FORMATS = ("%d.%m.%Y", "%d-%m-%Y", "%Y-%m-%d", "%d/%m/%Y", "%d-%b-%Y", "%d %b %Y")
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(s: str) -> Optional[datetime]:
+    """Parse a sheet-name date, dispatching on shape before strptime
+
+    A failed strptime raises, so blindly trying every format paid for
+    several caught exceptions per miss. The separator/length check picks
+    the single likely format first; the remaining formats are still
+    tried in the original order so non-padded values keep parsing. Sheet
+    names repeat across calls, hence the memoization.
+    """
+    fmt = None
+    if len(s) == 10:
+        if s[2] == '.':
+            fmt = "%d.%m.%Y"
+        elif s[2] == '-':
+            fmt = "%d-%m-%Y"
+        elif s[4] == '-':
+            fmt = "%Y-%m-%d"
+        elif s[2] == '/':
+            fmt = "%d/%m/%Y"
+    elif '-' in s:
+        fmt = "%d-%b-%Y"
+    elif ' ' in s:
+        fmt = "%d %b %Y"
+    if fmt is not None:
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            pass
+    for other in _DATE_FORMATS:
+        if other == fmt:
+            continue
+        try:
+            return datetime.strptime(s, other)
+        except ValueError:
+            continue
+    return None
+
+
+# openpyxl skips cell-style objects and formula graphs in this mode,
+# which is all the extractors need
+_ENGINE_KWARGS = {"read_only": True, "data_only": True}
+
 
 class ExcelUtils:
     """Utility class for Excel operations"""
-    
+
+    def __init__(self):
+        # Parsed workbooks cached per (path, mtime): processing N stocks
+        # re-read the same two files roughly 2N times before. A new upload
+        # changes the mtime and naturally invalidates the entries.
+        self._sheetnames_cache: Dict[Path, tuple] = {}
+        self._frame_cache: Dict[tuple, tuple] = {}
+
     @staticmethod
     def safe_read_excel(path: Path, sheet_name=None, header=0, engine="openpyxl"):
-        """Read Excel file without locking"""
-        with open(path, "rb") as f:
-            return pd.read_excel(BytesIO(f.read()), sheet_name=sheet_name, header=header, dtype=str, engine=engine).fillna("")
-    
+        """Read Excel file
+
+        The path goes straight to the reader: the old read()+BytesIO
+        dance held two full copies of the workbook in RAM before parsing
+        began. Uploads unlink before rewriting, so a read already in
+        flight keeps seeing the old inode.
+        """
+        return pd.read_excel(
+            path, sheet_name=sheet_name, header=header,
+            dtype=str, engine=engine, engine_kwargs=_ENGINE_KWARGS
+        ).fillna("")
+
     @staticmethod
     def safe_read_excel_sheetnames(path: Path, engine="openpyxl"):
-        """Get Excel sheet names without locking"""
-        with open(path, "rb") as f:
-            xl = pd.ExcelFile(BytesIO(f.read()), engine=engine)
-            names = xl.sheet_names
-            xl.close()
-            return names
-    
+        """Get Excel sheet names"""
+        xl = pd.ExcelFile(path, engine=engine, engine_kwargs=_ENGINE_KWARGS)
+        names = xl.sheet_names
+        xl.close()
+        return names
+
+    def read_sheetnames(self, path: Path) -> List[str]:
+        """Sheet names for a workbook, cached until the file changes"""
+        mtime = path.stat().st_mtime_ns
+        cached = self._sheetnames_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        names = self.safe_read_excel_sheetnames(path)
+        self._sheetnames_cache[path] = (mtime, names)
+        return names
+
+    def read_sheet(self, path: Path, sheet_name, header=0) -> pd.DataFrame:
+        """One sheet of a workbook, cached until the file changes
+
+        Callers must treat the returned frame as read-only; filtered
+        views and copies are fine.
+        """
+        mtime = path.stat().st_mtime_ns
+        key = (path, sheet_name, header)
+        cached = self._frame_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        df = self.safe_read_excel(path, sheet_name=sheet_name, header=header)
+        if header is not None:
+            df.columns = [str(c).strip() for c in df.columns]
+        self._frame_cache[key] = (mtime, df)
+        return df
+
+    def read_rows(self, path: Path, sheet_name) -> List[tuple]:
+        """Rows of one sheet as stripped-string tuples, cached until the
+        file changes
+
+        Streams through openpyxl's read-only iterator instead of
+        materializing a DataFrame just to scan text cells; rows are
+        padded to a uniform width since the streaming reader trims
+        trailing empty cells per row.
+        """
+        mtime = path.stat().st_mtime_ns
+        key = (path, sheet_name, "rows")
+        cached = self._frame_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb[sheet_name]
+            rows = [
+                ["" if c is None else str(c).strip() for c in row]
+                for row in ws.iter_rows(values_only=True)
+            ]
+        finally:
+            wb.close()
+
+        width = max((len(r) for r in rows), default=0)
+        rows = [tuple(r + [""] * (width - len(r))) for r in rows]
+        self._frame_cache[key] = (mtime, rows)
+        return rows
+
+    def _live_scan(self, path: Path, sheet_name) -> tuple:
+        """Rows, joined line texts and the OPT block index for one sheet,
+        cached until the file changes
+
+        One pass over the sheet records the first header line per symbol,
+        so locating a stock's block is a dict lookup instead of a fresh
+        regex scan of every line for every stock.
+        """
+        mtime = path.stat().st_mtime_ns
+        key = (path, sheet_name, "scan")
+        cached = self._frame_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2], cached[3]
+
+        rows = self.read_rows(path, sheet_name)
+        texts = [" ".join(v for v in row if v) for row in rows]
+        block_index: Dict[str, int] = {}
+        for i, line in enumerate(texts):
+            m = _OPT_SYMBOL.search(line)
+            if m:
+                block_index.setdefault(m.group(1).upper(), i)
+
+        self._frame_cache[key] = (mtime, rows, texts, block_index)
+        return rows, texts, block_index
+
     @staticmethod
     def try_parse_date(txt: str) -> Optional[datetime]:
         """Try to parse date from text"""
-        txt = str(txt).strip()
-        for fmt in ("%d.%m.%Y", "%d-%m-%Y", "%Y-%m-%d", "%d/%m/%Y", "%d-%b-%Y", "%d %b %Y"):
-            try:
-                return datetime.strptime(txt, fmt)
-            except:
-                continue
-        return None
+        return _parse_date(str(txt).strip())
     
     @staticmethod
     def pick_latest_sheet(sheet_names: List[str], target_date=None) -> str:
@@ -68,111 +236,272 @@ class ExcelUtils:
         if not x or x == "":
             return ""
         try:
-            return f"{float(x):,.0f}"
-        except:
+            return _format_number_cached(x)
+        except TypeError:  # Unhashable input cannot be memoized
             return str(x)
     
     @staticmethod
     def to_number(s) -> Optional[float]:
-        """Convert string to number"""
+        """Convert string to number
+
+        Parentheses or a leading minus mean negative; everything else
+        non-numeric is scrubbed before conversion, so "1e5" parses as 15
+        and "inf" as None. to_number_array applies the same rules, and
+        the two must not drift: historical cells go through the array
+        path and live cells through this one, so a divergence would
+        format identical cell text differently between the two tables.
+        """
         if not s:
             return None
         s = str(s).strip()
         neg = s.startswith("(") and s.endswith(")")
         if neg:
             s = s[1:-1]
-        s_clean = re.sub(r'[^0-9\.]', '', s)
+        if s.startswith("-"):
+            neg = True
+            s = s[1:]
+        # Fast path: digits, comma grouping and one decimal point parse
+        # directly; anything else takes the regex scrub so the accepted
+        # shapes stay identical to to_number_array
+        t = s.replace(",", "")
+        if t and t.replace(".", "", 1).isdigit():
+            try:
+                return -float(t) if neg else float(t)
+            except ValueError:
+                pass
+        s_clean = _NON_NUM.sub('', s)
         try:
             return -float(s_clean) if neg else float(s_clean)
         except:
             return None
     
+    @staticmethod
+    def to_number_fast(s) -> Optional[float]:
+        """to_number via a single character scan
+
+        One pass classifies the string and collects its digits with no
+        intermediate replace() copies; the final float() runs on the
+        cleaned text, so results match to_number exactly. Anything the
+        scan cannot classify as a plain number (exponents, embedded
+        text, nested signs) drops back to the reference implementation.
+        """
+        if not s:
+            return None
+        s = str(s).strip()
+        if not s:
+            return None
+        neg = False
+        start, end = 0, len(s)
+        if s[0] == "(" and s[-1] == ")":
+            neg = True
+            start, end = 1, end - 1
+
+        chars = []
+        seen_dot = False
+        for i in range(start, end):
+            c = s[i]
+            if c.isdigit():
+                chars.append(c)
+            elif c == ',':
+                continue
+            elif c == '.' and not seen_dot:
+                seen_dot = True
+                chars.append(c)
+            elif c == '-' and i == start and not neg:
+                chars.append(c)
+            else:
+                return ExcelUtils.to_number(s)
+
+        try:
+            val = float("".join(chars))
+        except ValueError:
+            return None
+        return -val if neg else val
+
+    @staticmethod
+    def to_number_array(values) -> np.ndarray:
+        """Vectorized to_number over a sequence of cell values
+
+        Batched counterpart of to_number with identical sign and scrub
+        rules: one pandas pass replaces a Python-level parse per cell.
+        Empty and unparseable values come back as NaN instead of None.
+        """
+        s = pd.Series(values).astype(str).str.strip()
+        neg = s.str.startswith("(") & s.str.endswith(")")
+        s = s.where(~neg, s.str[1:-1])
+        neg = neg | s.str.startswith("-")
+        n = pd.to_numeric(s.str.replace(r'[^0-9.]', '', regex=True), errors='coerce')
+        return n.where(~neg, -n).to_numpy(dtype=float)
+
     @staticmethod
     def strike_key(s) -> Any:
-        """Generate strike key"""
+        """Generate strike key
+
+        A decimal point truncates: "3000.0" keys as 3000, since folding
+        the fractional digits in would key it as a different strike than
+        the integer spelling of the same value.
+        """
         if not s:
             return ""
-        s_clean = re.sub(r'[^0-9]', '', str(s))
-        return int(s_clean) if s_clean.isdigit() else str(s).upper()
-    
+        s = str(s)
+        # Fast path: plain digit strings need no regex scrub
+        if s.isdigit():
+            return int(s)
+        s_clean = _NON_DIGIT.sub('', s.partition(".")[0])
+        return int(s_clean) if s_clean.isdigit() else s.upper()
+
+    @staticmethod
+    def strike_key_array(values) -> np.ndarray:
+        """Vectorized strike_key over a sequence of cell values
+
+        One C-level pass truncates at the decimal point, strips the
+        non-digits and converts the lot. Returns int64 with -1 marking
+        entries whose scalar strike_key would fall back to a string
+        (empty or digit-free values), since a single dtype cannot mix
+        ints and text.
+        """
+        s = pd.Series(values).astype(str)
+        n = pd.to_numeric(s.str.replace(r'\..*|[^0-9]', '', regex=True), errors='coerce')
+        return n.fillna(-1).astype("int64").to_numpy()
+
     def extract_historical_table(self, hist_path: Path, stock: str) -> List[Dict[str, Any]]:
         """Extract historical data"""
         try:
-            sheet_names = self.safe_read_excel_sheetnames(hist_path)
+            sheet_names = self.read_sheetnames(hist_path)
             sheet = self.pick_latest_sheet(sheet_names)
-            df = self.safe_read_excel(hist_path, sheet_name=sheet)
-            df.columns = [str(c).strip() for c in df.columns]
-            
-            stock_col = next((c for c in df.columns if re.search(r"stock|symbol|name", c, re.I)), None)
+            df = self.read_sheet(hist_path, sheet)
+
+            stock_col = next((c for c in df.columns if _STOCK_COL.search(c)), None)
             if not stock_col:
                 return []
-            
-            df["__clean"] = df[stock_col].str.upper().str.strip().apply(lambda x: re.sub(r'\W+', '', x))
-            
-            if stock.upper() not in df["__clean"].values:
-                return []
-            
-            data = df[df["__clean"] == stock.upper()].copy()
+
+            # Local series: the cached frame itself is never mutated
+            clean = df[stock_col].str.upper().str.strip().str.replace(_NON_WORD, '', regex=True)
+
+            data = df[clean == stock.upper()]
             if data.empty:
                 return []
-            
-            result = []
-            for _, r in data.iterrows():
-                row = {
-                    col: str(r.get(col, "")) 
-                    for col in ["Stock", "Category", "Strike", "Prev_OI", "Latest_OI", 
-                               "Call_OI_Difference", "Put_OI_Difference", "LTP", "Additional_Strike"]
-                }
-                
-                for k in ["Prev_OI", "Latest_OI", "Call_OI_Difference", "Put_OI_Difference"]:
-                    row[k] = self.format_number(self.to_number(row[k]))
-                
-                row["Additional_Strike"] = str(row.get("Additional_Strike", "")).strip()
-                result.append(row)
-            
-            return result
+
+            return self._historical_records(data)
         except Exception as e:
             print(f"Historical error {stock}: {e}")
             return []
-    
-    def extract_live_table(self, live_path: Path, hist_path: Path, stock: str) -> List[Dict[str, Any]]:
-        """Extract live data from Live.xlsx"""
+
+    @staticmethod
+    def _format_number_series(s: pd.Series) -> pd.Series:
+        """Vectorized equivalent of format_number(to_number(v)) per cell
+
+        Single C-level pandas pass per column instead of two Python
+        function calls and a fresh regex substitution per cell. Zero and
+        unparseable values format to "" to match the scalar helpers.
+        """
+        n = pd.Series(ExcelUtils.to_number_array(s), index=s.index)
+        return n.map(lambda x: "" if pd.isna(x) or x == 0 else f"{x:,.0f}")
+
+    def _historical_records(self, data: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Shape filtered historical rows into output records"""
+        # Build the output columnar instead of iterating rows
+        out_columns = ["Stock", "Category", "Strike", "Prev_OI", "Latest_OI",
+                       "Call_OI_Difference", "Put_OI_Difference", "LTP", "Additional_Strike"]
+        out = pd.DataFrame({
+            col: data[col].astype(str) if col in data.columns else ""
+            for col in out_columns
+        }, index=data.index)
+
+        for k in ["Prev_OI", "Latest_OI", "Call_OI_Difference", "Put_OI_Difference"]:
+            out[k] = self._format_number_series(out[k])
+
+        out["Additional_Strike"] = out["Additional_Strike"].str.strip()
+
+        return out.to_dict("records")
+
+    def extract_all_historical(self, hist_path: Path) -> Dict[str, List[Dict[str, Any]]]:
+        """Extract historical data for every stock in a single pass
+
+        One scan plus one groupby replaces the O(stocks x rows) repeated
+        filtering of calling extract_historical_table per stock. Keys are
+        the cleaned (uppercased, non-alphanumerics stripped) symbols.
+        """
         try:
-            # First, get historical data for comparison
-            sheet_names = self.safe_read_excel_sheetnames(hist_path)
-            sheet1 = self.pick_latest_sheet(sheet_names)
-            df1 = self.safe_read_excel(hist_path, sheet_name=sheet1)
-            df1.columns = [str(c).strip() for c in df1.columns]
-            
-            stock_col = next((c for c in df1.columns if re.search(r"stock|symbol|name", c, re.I)), None)
-            call_map, put_map, all_strikes = {}, {}, set()
-            add_map = {}
-            
-            if stock_col:
-                df1["__clean"] = df1[stock_col].str.upper().str.strip().apply(lambda x: re.sub(r'\W+', '', x))
-                df1 = df1[df1["__clean"] == stock.upper()]
-                
-                for _, r in df1.iterrows():
-                    k = self.strike_key(r.get("Strike", ""))
+            sheet_names = self.read_sheetnames(hist_path)
+            sheet = self.pick_latest_sheet(sheet_names)
+            df = self.read_sheet(hist_path, sheet)
+
+            stock_col = next((c for c in df.columns if _STOCK_COL.search(c)), None)
+            if not stock_col:
+                return {}
+
+            clean = df[stock_col].str.upper().str.strip().str.replace(_NON_WORD, '', regex=True)
+            return {
+                key: self._historical_records(group)
+                for key, group in df.groupby(clean, sort=False)
+            }
+        except Exception as e:
+            print(f"Historical error (all stocks): {e}")
+            return {}
+
+    def _hist_reference(self, hist_path: Path) -> Dict[str, tuple]:
+        """Per-stock live-comparison maps from the historical sheet,
+        cached until the file changes
+
+        One grouped pass builds (call_map, put_map, add_map, all_strikes)
+        for every stock, replacing the refilter of the whole frame that
+        extract_live_table used to repeat per stock.
+        """
+        mtime = hist_path.stat().st_mtime_ns
+        key = (hist_path, "reference")
+        cached = self._frame_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        reference: Dict[str, tuple] = {}
+        sheet_names = self.read_sheetnames(hist_path)
+        sheet = self.pick_latest_sheet(sheet_names)
+        df = self.read_sheet(hist_path, sheet)
+
+        stock_col = next((c for c in df.columns if _STOCK_COL.search(c)), None)
+        if stock_col:
+            clean = df[stock_col].str.upper().str.strip().str.replace(_NON_WORD, '', regex=True)
+            # itertuples avoids the per-row Series allocation of
+            # iterrows; reindex guarantees all four columns exist
+            ref_cols = df.reindex(columns=["Strike", "Latest_OI", "Category", "Additional_Strike"],
+                                  fill_value="")
+            for symbol, group in ref_cols.groupby(clean, sort=False):
+                call_map, put_map, add_map = {}, {}, {}
+                all_strikes = set()
+                for strike, latest_oi, category, additional in group.itertuples(index=False):
+                    k = self.strike_key(strike)
                     all_strikes.add(k)
-                    v = self.to_number(r.get("Latest_OI", ""))
-                    cat = str(r.get("Category", "")).lower()
-                    
+                    v = self.to_number(latest_oi)
+                    cat = str(category).lower()
+
                     if "call" in cat and v is not None:
                         call_map[k] = v
                     if "put" in cat and v is not None:
                         put_map[k] = v
-                    
-                    raw_add = str(r.get("Additional_Strike", "")).strip()
+
+                    raw_add = str(additional).strip()
                     if raw_add:
                         low = raw_add.lower()
                         if low in ("yes", "y", "1", "true"):
                             add_map[k] = "Yes"
                         else:
                             add_map[k] = raw_add
-            
+                reference[symbol] = (call_map, put_map, add_map, all_strikes)
+
+        self._frame_cache[key] = (mtime, reference)
+        return reference
+
+    def extract_live_table(self, live_path: Path, hist_path: Path, stock: str) -> List[Dict[str, Any]]:
+        """Extract live data from Live.xlsx"""
+        try:
+            # Historical comparison maps come from one cached grouped
+            # pass instead of a per-stock scan of the whole sheet
+            call_map, put_map, add_map, all_strikes = self._hist_reference(hist_path).get(
+                stock.upper(), ({}, {}, {}, set()))
+
             # Read live data
-            live_sheet_names = self.safe_read_excel_sheetnames(live_path)
+            live_sheet_names = self.read_sheetnames(live_path)
             today = datetime.now().date()
             chosen = None
             dated = []
@@ -188,24 +517,28 @@ class ExcelUtils:
             if not chosen:
                 chosen = max(dated, key=lambda x: x[0])[1] if dated else live_sheet_names[-1]
             
-            raw = self.safe_read_excel(live_path, sheet_name=chosen, header=None)
-            texts = [" ".join([str(x).strip() for x in row if str(x).strip()]) for row in raw.values]
-            
-            stock_norm = re.sub(r'\W+', '', stock.upper())
-            start_idx = self._find_live_block_start(texts, stock_norm)
-            
+            rows, texts, block_index = self._live_scan(live_path, chosen)
+
+            stock_norm = _NON_WORD.sub('', stock.upper())
+            # Exact symbols resolve via the shared index; the per-stock
+            # regex scan remains for headers the index pass cannot key
+            # (e.g. symbols with stripped punctuation)
+            start_idx = block_index.get(stock_norm)
+            if start_idx is None:
+                start_idx = self._find_live_block_start(texts, stock_norm)
+
             if start_idx is None:
                 return []
-            
+
             end_idx = next((j for j in range(start_idx + 1, len(texts))
-                           if re.search(r'^\s*OPT[_\-\s]?[A-Za-z0-9]+', texts[j], re.I)), len(texts))
-            
-            block = raw.iloc[start_idx:end_idx].reset_index(drop=True)
-            
+                           if _OPT_HEADER.search(texts[j])), len(texts))
+
+            block = rows[start_idx:end_idx]
+            block_texts = texts[start_idx:end_idx]
+
             # Find sections
             sections = {}
-            for i in range(len(block)):
-                line = " ".join([str(x).strip() for x in block.iloc[i]])
+            for i, line in enumerate(block_texts):
                 tl = line.lower()
                 if 'call support' in tl:
                     sections['Call Support'] = i
@@ -215,45 +548,54 @@ class ExcelUtils:
                     sections['Call Resistance'] = i
                 if 'put resistance' in tl:
                     sections['Put Resistance'] = i
-            
-            result = []
+
+            # Collect the rows first, then compute every OI difference in
+            # one vectorized subtraction instead of per-row arithmetic
+            picked = []
             for sec_name, sec_idx in sections.items():
+                is_call = "call" in sec_name.lower()
                 for r in range(sec_idx + 1, len(block)):
-                    row_vals = [str(x).strip() for x in block.iloc[r]]
+                    row_vals = block[r]
                     if all(v == "" for v in row_vals):
                         break
-                    if any(h in " ".join(row_vals).lower() for h in 
+                    if any(h in block_texts[r].lower() for h in
                           ('call support', 'put support', 'call resistance', 'put resistance')):
                         break
                     if len(row_vals) < 10:
                         continue
-                    
-                    if "call" in sec_name.lower():
+
+                    if is_call:
                         label, prev_oi, strike = row_vals[0], row_vals[1], row_vals[2]
                     else:
                         label, prev_oi, strike = row_vals[6], row_vals[7], row_vals[8]
-                    
-                    prev_num = self.to_number(prev_oi)
-                    sk = self.strike_key(strike)
-                    oi_diff = ""
-                    
-                    if prev_num is not None:
-                        base = call_map.get(sk, 0) if "call" in sec_name.lower() else put_map.get(sk, 0)
-                        oi_diff = self.format_number(prev_num - base)
-                    
-                    add_strike_value = add_map.get(sk, "")
-                    
-                    result.append({
-                        "Section": sec_name,
-                        "Label": label,
-                        "Prev_OI": self.format_number(prev_num),
-                        "Strike": strike,
-                        "Stock": stock,
-                        "OI_Diff": oi_diff,
-                        "Is_NewStrike": "Yes" if sk not in all_strikes else "",
-                        "Add_Strike": add_strike_value
-                    })
-            
+                    picked.append((sec_name, is_call, label, prev_oi, strike))
+
+            if not picked:
+                return []
+
+            keys = [self.strike_key(p[4]) for p in picked]
+            prev_nums = [self.to_number(p[3]) for p in picked]
+            prev_arr = np.array([np.nan if v is None else v for v in prev_nums], dtype=float)
+            base_arr = np.array([
+                (call_map if is_call else put_map).get(k, 0)
+                for (_, is_call, _, _, _), k in zip(picked, keys)
+            ], dtype=float)
+            diffs = prev_arr - base_arr
+
+            result = []
+            for (sec_name, _, label, _, strike), sk, prev_num, diff in zip(
+                    picked, keys, prev_nums, diffs):
+                result.append({
+                    "Section": sec_name,
+                    "Label": label,
+                    "Prev_OI": self.format_number(prev_num),
+                    "Strike": strike,
+                    "Stock": stock,
+                    "OI_Diff": "" if prev_num is None else self.format_number(diff),
+                    "Is_NewStrike": "Yes" if sk not in all_strikes else "",
+                    "Add_Strike": add_map.get(sk, "")
+                })
+
             return result
         except Exception as e:
             print(f"Live error {stock}: {e}")
@@ -262,7 +604,8 @@ class ExcelUtils:
     @staticmethod
     def _find_live_block_start(texts: List[str], stock_norm: str) -> Optional[int]:
         """Find start of stock block in live data"""
+        pattern = _opt_block_pattern(stock_norm)
         for i, line in enumerate(texts):
-            if re.search(rf"OPT[_\-\s]*{re.escape(stock_norm)}", line, re.I):
+            if pattern.search(line):
                 return i
         return None
@@ -3,22 +3,36 @@ Stock Service
 Business logic for stock data operations
 Reads from SQLite database instead of JSON files
 """
+import asyncio
+import hashlib
 import json
 import os
 from typing import List
 from pathlib import Path
 
+import orjson
+from pydantic import TypeAdapter
+
 from app.models.schemas import StockSummaryResponse, HistoricalDataRow, LiveDataRow
-from app.core.config import settings
+from app.core.cache import stock_cache
+from app.core.config import settings, ALL_STOCKS_SET
 from app.core.database_sqlalchemy import db
 
+# Batch adapters validate a whole list in one pydantic-core call instead
+# of constructing models row by row from Python
+_HIST_ADAPTER = TypeAdapter(List[HistoricalDataRow])
+_LIVE_ADAPTER = TypeAdapter(List[LiveDataRow])
+
 
 class StockService:
     """Service for handling stock data operations"""
     
     def __init__(self):
         self.base_dir = Path(settings.BASE_DIR)
-    
+        # favorites.txt rarely changes; cache it keyed by mtime so a
+        # request normally costs one stat instead of an open+parse
+        self._fav_cache: tuple = ()
+
     async def get_all_stocks(self) -> List[str]:
         """
         Get list of all available stocks from database
@@ -26,12 +40,18 @@ class StockService:
         Returns:
             List of stock symbols
         """
-        # Get stocks from database
-        stocks_from_db = db.get_all_stocks_from_db()
-        
+        cached = stock_cache.get("all_stocks")
+        if cached is not None:
+            return cached
+
+        # Get stocks from database; to_thread keeps the event loop free
+        # while SQLite works
+        stocks_from_db = await asyncio.to_thread(db.get_all_stocks_from_db)
+
         if stocks_from_db:
+            stock_cache.set("all_stocks", stocks_from_db)
             return stocks_from_db
-        
+
         # Fallback to config if database is empty
         return settings.ALL_STOCKS
     
@@ -45,16 +65,66 @@ class StockService:
         Returns:
             StockSummaryResponse with historical and live data
         """
-        # Get data from database
-        historical_data = db.get_historical_data(stock.upper())
-        live_data = db.get_live_data(stock.upper())
-        
-        # Convert to Pydantic models
-        historical = [HistoricalDataRow(**row) for row in historical_data]
-        live = [LiveDataRow(**row) for row in live_data]
-        
-        return StockSummaryResponse(historical=historical, live=live)
-    
+        stock = stock.upper()
+        cache_key = f"stock:{stock}"
+        cached = stock_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Both reads run in worker threads concurrently; the event loop
+        # keeps serving other requests meanwhile
+        historical_data, live_data = await asyncio.gather(
+            asyncio.to_thread(db.get_historical_data, stock),
+            asyncio.to_thread(db.get_live_data, stock),
+        )
+
+        # Validate both lists in single batch calls into pydantic-core
+        historical = _HIST_ADAPTER.validate_python(historical_data)
+        live = _LIVE_ADAPTER.validate_python(live_data)
+
+        response = StockSummaryResponse(historical=historical, live=live)
+        # Only known symbols are cached: the path parameter is caller
+        # controlled, and TTLCache evicts a key only when that same key
+        # is read after expiry, so arbitrary-symbol scans would grow the
+        # cache without bound
+        if stock in ALL_STOCKS_SET:
+            stock_cache.set(cache_key, response)
+        return response
+
+    async def get_stock_summary_json(self, stock: str) -> tuple:
+        """
+        Get a stock summary as pre-serialized JSON bytes plus its ETag
+
+        Hot reads skip Pydantic model construction and per-request
+        serialization entirely: the raw DB dicts are dumped once with
+        orjson and the bytes are cached until the data changes. The ETag
+        is hashed from the payload at cache fill, so conditional GETs
+        cost one header comparison.
+
+        Args:
+            stock: Stock symbol in uppercase
+
+        Returns:
+            (UTF-8 JSON bytes for the StockSummaryResponse shape, ETag)
+        """
+        stock = stock.upper()
+        cache_key = f"stock_json:{stock}"
+        cached = stock_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        historical_data, live_data = await asyncio.gather(
+            asyncio.to_thread(db.get_historical_data, stock),
+            asyncio.to_thread(db.get_live_data, stock),
+        )
+        payload = orjson.dumps({"historical": historical_data, "live": live_data})
+        etag = f'"{hashlib.md5(payload).hexdigest()}"'
+        # Unknown symbols are served but never cached, keeping the cache
+        # bounded by the configured stock list (see get_stock_summary)
+        if stock in ALL_STOCKS_SET:
+            stock_cache.set(cache_key, (payload, etag))
+        return payload, etag
+
     async def get_favorites(self) -> List[str]:
         """
         Get list of favorite stocks from favorites.txt
@@ -63,11 +133,16 @@ class StockService:
             List of favorite stock symbols
         """
         favorites_path = self.base_dir / "favorites.txt"
-        
+
         if not favorites_path.exists():
             return []
-        
+
+        mtime = favorites_path.stat().st_mtime_ns
+        if self._fav_cache and self._fav_cache[0] == mtime:
+            return self._fav_cache[1]
+
         with open(favorites_path, "r", encoding="utf-8") as f:
             favorites = [line.strip() for line in f if line.strip()]
-        
+
+        self._fav_cache = (mtime, favorites)
         return favorites
@@ -4,7 +4,7 @@ Options Dashboard - Live OI Tracker
 """
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
@@ -53,6 +53,7 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     version=settings.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json"
@@ -82,11 +83,14 @@ app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/", response_class=HTMLResponse)
 async def root():
-    """Serve the main HTML page"""
+    """Serve the main HTML page
+
+    FileResponse streams the file via sendfile instead of reading and
+    decoding it into a Python string on every hit.
+    """
     html_path = TEMPLATES_DIR / "index.html"
     if html_path.exists():
-        with open(html_path, "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
+        return FileResponse(html_path, media_type="text/html")
     return HTMLResponse(content="<h1>Options Dashboard API</h1><p>Visit <a href='/api/docs'>/api/docs</a> for API documentation</p>")
 
 
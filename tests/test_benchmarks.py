@@ -0,0 +1,29 @@
+"""
+Parser Benchmarks
+Performance floors for the ExcelUtils scalar parsers
+"""
+import pytest
+
+# Skips the whole module when the pytest-benchmark dev extra is absent,
+# so plain correctness runs do not need the plugin
+pytest.importorskip("pytest_benchmark")
+
+from app.services.excel_utils import ExcelUtils
+
+
+@pytest.mark.slow
+def test_bench_format_number(benchmark):
+    """Floor for scalar number formatting"""
+    benchmark(lambda: [ExcelUtils.format_number(1234567) for _ in range(10_000)])
+
+
+@pytest.mark.slow
+def test_bench_to_number(benchmark):
+    """Floor for scalar string-to-number parsing"""
+    benchmark(lambda: [ExcelUtils.to_number("1,000") for _ in range(10_000)])
+
+
+@pytest.mark.slow
+def test_bench_strike_key(benchmark):
+    """Floor for scalar strike key generation"""
+    benchmark(lambda: [ExcelUtils.strike_key("3000") for _ in range(10_000)])
@@ -0,0 +1,32 @@
+"""
+Parser Property Tests
+Generative round-trip and equivalence checks for the ExcelUtils parsers
+"""
+import pytest
+
+# Skips the whole module when the hypothesis dev extra is absent, so
+# plain correctness runs do not need it
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, settings, strategies as st
+
+from app.services.excel_utils import ExcelUtils
+
+
+@settings(max_examples=200, deadline=None)
+@given(st.integers(-10**12, 10**12))
+def test_number_roundtrip(n):
+    """format_number then to_number returns the original integer
+
+    Zero is the documented exception: it formats to "" and parses back
+    to None.
+    """
+    expected = None if n == 0 else float(n)
+    assert ExcelUtils.to_number(ExcelUtils.format_number(n)) == expected
+
+
+@settings(max_examples=200, deadline=None)
+@given(st.text(alphabet="0123456789.,-() eE", max_size=15))
+def test_to_number_fast_equivalence(s):
+    """Char-scan parser matches the reference on arbitrary input"""
+    assert ExcelUtils.to_number_fast(s) == ExcelUtils.to_number(s)